@@ -12,16 +12,23 @@ import os
 import json
 import time
 import logging
+import threading
+from collections import OrderedDict
 from datetime import datetime
+from types import MappingProxyType
 from typing import Dict, List, Optional, Tuple, Any
 
 import pandas as pd
 import numpy as np
 import joblib
-from flask import Flask, request, jsonify
+import orjson
+from flask import Flask, request
 from flask_cors import CORS
 import warnings
 
+from batching import MicroBatcher
+from descriptors import canonical_smiles, compute_descriptors, compute_descriptors_batch
+
 # Suppress warnings for cleaner output
 warnings.filterwarnings('ignore')
 
@@ -40,10 +47,28 @@ if os.environ.get('FLASK_ENV') == 'production':
 else:
     CORS(app, origins=["http://localhost:3000", "http://127.0.0.1:3000"])  # Restrict in development
 
+# Maximum number of distinct molecules kept in the prediction cache
+PREDICTION_CACHE_SIZE = 4096
+
+# Micro-batching of concurrent /predict calls (set MICRO_BATCHING=0 to disable)
+MICRO_BATCHING_ENABLED = os.environ.get('MICRO_BATCHING', '1') != '0'
+MICRO_BATCH_MAX_SIZE = 32
+MICRO_BATCH_MAX_WAIT = 0.005  # seconds the collector waits for more requests
+MICRO_BATCH_TIMEOUT = 0.05    # seconds a request waits before predicting on its own
+
+def _json_response(payload: Any, status: int = 200):
+    """Serialize a response with orjson (C-implemented, handles numpy values natively)"""
+    return app.response_class(
+        orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY),
+        status=status,
+        mimetype='application/json'
+    )
+
 # Global variables for models and data
 models = {}
 dataset_embeddings = None
-smiles_to_embedding = {}
+smiles_index: Dict[str, int] = {}  # SMILES -> row of embedding_matrix
+embedding_matrix = None
 target_columns = []
 feature_columns = []
 dataset_stats = {}
@@ -51,27 +76,193 @@ dataset_stats = {}
 # Try to import RDKit
 try:
     from rdkit import Chem
-    from rdkit.Chem import Descriptors
     RDKIT_AVAILABLE = True
     logger.info("✅ RDKit available - Full molecular processing enabled")
 except ImportError:
     RDKIT_AVAILABLE = False
     logger.warning("⚠️ RDKit not available - Using dataset lookup only")
 
+# Try to import pyarrow (enables the feather dataset cache)
+try:
+    import pyarrow  # noqa: F401
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Comprehensive molecular formulas to SMILES mapping
+# (ASCII digits only; subscript and case variants are folded in by _normalize_formula)
+_RAW_FORMULAS = {
+
+    # Simple inorganic molecules
+    'H2O': 'O',
+    'CO2': 'O=C=O',
+    'CO': '[C-]#[O+]',
+    'NH3': 'N',
+    'CH4': 'C',
+    'H2': '[H][H]',
+    'O2': 'O=O',
+    'N2': 'N#N',
+    'HCl': 'Cl',
+    'HF': 'F',
+    'HBr': 'Br',
+    'HI': 'I',
+    'H2S': 'S',
+    'SO2': 'O=S=O',
+    'NO': '[N]=O',
+    'NO2': '[N+](=O)[O-]',
+    'N2O': '[N-]=[N+]=O',
+    'HNO3': 'O[N+](=O)[O-]',
+    'H2SO4': 'OS(=O)(=O)O',
+    'H3PO4': 'OP(=O)(O)O',
+
+    # Alcohols (single safest choice)
+    'CH3OH': 'CO',
+    'C2H6O': 'CCO',
+    'C3H8O': 'CCCO',
+    'C4H10O': 'CCCCO',
+
+    # Aldehydes & ketones
+    'CH2O': 'C=O',
+    'C2H4O': 'CC=O',
+    'C3H6O': 'CC(=O)C',
+
+    # Carboxylic acids
+    'CH2O2': 'C(=O)O',
+    'C2H4O2': 'CC(=O)O',
+    'C3H6O2': 'CCC(=O)O',
+    'C4H8O2': 'CCCC(=O)O',
+    'C7H6O2': 'O=C(O)c1ccccc1',
+
+    # Alkanes
+    'C2H6': 'CC',
+    'C3H8': 'CCC',
+    'C4H10': 'CCCC',
+    'C5H12': 'CCCCC',
+    'C6H14': 'CCCCCC',
+
+    # Alkenes
+    'C2H4': 'C=C',
+    'C3H6': 'CC=C',
+
+    # Alkynes
+    'C2H2': 'C#C',
+    'C3H4': 'CC#C',
+
+    # Aromatics
+    'C6H6': 'c1ccccc1',
+    'C7H8': 'Cc1ccccc1',
+    'C6H5OH': 'Oc1ccccc1',
+    'C6H4Cl2': 'Clc1ccc(Cl)cc1',
+
+    # Amines
+    'CH5N': 'CN',
+    'C2H7N': 'CCN',
+    'C3H9N': 'CCCN',
+    'C6H7N': 'Nc1ccccc1',
+
+    # Amides (corrected)
+    'CH3NO': 'C(=O)N',
+    'C2H5NO': 'CC(=O)N',
+
+    # Nitriles
+    'C2H3N': 'CC#N',
+    'C6H5CN': 'N#Cc1ccccc1',
+
+    # Halogenated
+    'CH3Cl': 'CCl',
+    'CHCl3': 'C(Cl)(Cl)Cl',
+    'CCl4': 'C(Cl)(Cl)(Cl)Cl',
+
+    # Common biomolecules
+    'C6H12O6': 'C([C@@H]1[C@H]([C@@H]([C@H]([C@H](O1)O)O)O)O)O',
+    'C2H6O2': 'OCCO',
+    'C3H8O3': 'OCC(O)CO',
+
+}
+
+# Unicode subscript digits -> ASCII digits
+_SUBSCRIPT_TABLE = str.maketrans('₀₁₂₃₄₅₆₇₈₉', '0123456789')
+
+
+def _normalize_formula(formula: str) -> str:
+    """Strip spaces, map subscript digits to ASCII and upper-case a formula"""
+    return formula.strip().replace(' ', '').translate(_SUBSCRIPT_TABLE).upper()
+
+
+# Normalized formula -> SMILES, keyed once at import so a lookup is a single get; read-only
+_FORMULA_MAP = MappingProxyType({
+    _normalize_formula(formula): smiles for formula, smiles in _RAW_FORMULAS.items()
+})
+
+
+class _LRUCache:
+    """Bounded least-recently-used map of canonical SMILES -> prediction tuple"""
+    
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Any:
+        """Return the cached value (marking it most recently used), or None"""
+        with self._lock:
+            value = self._data.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+    
+    def put(self, key: str, value: Any) -> None:
+        """Store a value, evicting the least recently used entry when full"""
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+    
+    def info(self) -> Dict[str, int]:
+        """Hit/miss counters and size, in the same shape as functools' cache_info()"""
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses,
+                    'maxsize': self.maxsize, 'currsize': len(self._data)}
+
+
 class MolecularPredictor:
     """Professional molecular prediction system with multi-level classification"""
     
     def __init__(self):
         self.models_loaded = False
         self.dataset_loaded = False
+        self.level2_groups = []
+        self.level2_estimators = []
+        self.prediction_cache = _LRUCache(PREDICTION_CACHE_SIZE)
+        self.batcher = MicroBatcher(
+            self.infer_rows,
+            max_batch=MICRO_BATCH_MAX_SIZE,
+            max_wait=MICRO_BATCH_MAX_WAIT,
+            timeout=MICRO_BATCH_TIMEOUT
+        ) if MICRO_BATCHING_ENABLED else None
+        # Precomputed predictions for every row of embedding_matrix
+        self.dataset_level1_pred = None
+        self.dataset_level1_confidence = None
+        self.dataset_group_probas = None
         self.load_models()
         self.load_dataset()
+        self.precompute_dataset_predictions()
     
     def load_models(self) -> bool:
         """Load all trained ML models with comprehensive error handling"""
         try:
             logger.info("🔄 Loading trained ML models...")
             
+            # Not memory-mapped: sklearn trees copy their node arrays into their own
+            # buffers on unpickling. Under gunicorn, preload_app shares the loaded
+            # models with workers copy-on-write instead
+            
             # Load Level 1 model (binary classification)
             level1_path = 'models/model_level1.pkl'
             if os.path.exists(level1_path):
@@ -90,32 +281,48 @@ class MolecularPredictor:
                 logger.error(f"❌ Level 2 models not found at {level2_path}")
                 return False
             
+            # Load metadata if available; mock models store the column lists here
+            metadata = {}
+            metadata_path = 'models/pipeline_metadata.json'
+            if os.path.exists(metadata_path):
+                with open(metadata_path, 'r') as f:
+                    metadata = json.load(f)
+                    logger.info(f"✅ Pipeline metadata loaded: {metadata.get('training_date', 'Unknown')}")
+            
             # Load target columns (functional group names)
+            global target_columns
             targets_path = 'models/target_columns.pkl'
-            if os.path.exists(targets_path):
-                global target_columns
+            if 'target_columns' in metadata:
+                target_columns = metadata['target_columns']
+                logger.info(f"✅ Target columns loaded: {len(target_columns)} functional groups")
+            elif os.path.exists(targets_path):
                 target_columns = joblib.load(targets_path)
                 logger.info(f"✅ Target columns loaded: {len(target_columns)} functional groups")
             else:
-                logger.error(f"❌ Target columns not found at {targets_path}")
+                logger.error(f"❌ Target columns not found in {metadata_path} or at {targets_path}")
                 return False
             
             # Load feature columns
+            global feature_columns
             features_path = 'models/feature_columns.pkl'
-            if os.path.exists(features_path):
-                global feature_columns
+            if 'feature_columns' in metadata:
+                feature_columns = metadata['feature_columns']
+                logger.info(f"✅ Feature columns loaded: {len(feature_columns)} dimensions")
+            elif os.path.exists(features_path):
                 feature_columns = joblib.load(features_path)
                 logger.info(f"✅ Feature columns loaded: {len(feature_columns)} dimensions")
             else:
-                logger.error(f"❌ Feature columns not found at {features_path}")
+                logger.error(f"❌ Feature columns not found in {metadata_path} or at {features_path}")
                 return False
             
-            # Load metadata if available
-            metadata_path = 'models/pipeline_metadata.json'
-            if os.path.exists(metadata_path):
-                with open(metadata_path, 'r') as f:
-                    metadata = json.load(f)
-                    logger.info(f"✅ Pipeline metadata loaded: {metadata.get('training_date', 'Unknown')}")
+            # Align Level 2 estimators with target_columns once so prediction
+            # iterates a plain list instead of doing per-group dict lookups
+            level2_models = models['level2']
+            missing_groups = [g for g in target_columns if g not in level2_models]
+            if missing_groups:
+                logger.warning(f"⚠️ No Level 2 model for groups: {missing_groups}")
+            self.level2_groups = [g for g in target_columns if g in level2_models]
+            self.level2_estimators = [level2_models[g] for g in self.level2_groups]
             
             self.models_loaded = True
             logger.info("🎉 All ML models loaded successfully!")
@@ -125,9 +332,59 @@ class MolecularPredictor:
             logger.error(f"❌ Error loading models: {str(e)}")
             return False
     
+    def read_dataset(self, csv_path: str) -> pd.DataFrame:
+        """Read only the SMILES and embedding columns, as float32
+        
+        With pyarrow installed, the parsed CSV is cached next to it as a
+        feather file, which later startups read instead of re-parsing. The
+        column selection depends on target_columns, so the cache is only
+        reused while those match the ones recorded in its .json sidecar.
+        """
+        feather_path = os.path.splitext(csv_path)[0] + '.feather'
+        cache_key_path = feather_path + '.json'
+        cache_key = {'target_columns': list(target_columns)}
+        if (PYARROW_AVAILABLE and os.path.exists(feather_path) and os.path.exists(cache_key_path)
+                and os.path.getmtime(feather_path) >= os.path.getmtime(csv_path)):
+            try:
+                with open(cache_key_path, 'r') as f:
+                    cache_hit = json.load(f) == cache_key
+            except (OSError, ValueError):
+                cache_hit = False
+            if cache_hit:
+                logger.info(f"Reading cached dataset from {feather_path}")
+                return pd.read_feather(feather_path)
+        
+        try:
+            # Infer the schema from a small sample, then parse with fixed dtypes
+            sample = pd.read_csv(csv_path, nrows=1000)
+            exclude = set(target_columns) | {'smiles'}
+            embedding_cols = [c for c in sample.select_dtypes(include=[np.number]).columns if c not in exclude]
+            needed_cols = (['smiles'] if 'smiles' in sample.columns else []) + embedding_cols
+            
+            df = pd.read_csv(
+                csv_path,
+                usecols=needed_cols,
+                dtype={c: np.float32 for c in embedding_cols},
+                engine='c'
+            )
+        except (ValueError, TypeError) as e:
+            logger.warning(f"⚠️ Typed CSV read failed ({e}) - falling back to full read")
+            return pd.read_csv(csv_path)
+        
+        if PYARROW_AVAILABLE:
+            try:
+                df.to_feather(feather_path)
+                with open(cache_key_path, 'w') as f:
+                    json.dump(cache_key, f)
+                logger.info(f"✅ Dataset cached as {feather_path}")
+            except Exception as e:
+                logger.warning(f"⚠️ Could not write feather cache: {e}")
+        
+        return df
+    
     def load_dataset(self) -> bool:
         """Load dataset for SMILES lookup and molecular embeddings"""
-        global dataset_embeddings, smiles_to_embedding, dataset_stats
+        global dataset_embeddings, smiles_index, embedding_matrix, dataset_stats
         
         try:
             logger.info("📊 Loading molecular dataset...")
@@ -139,12 +396,20 @@ class MolecularPredictor:
                 # Try to load mock SMILES features
                 mock_features_path = 'models/smiles_features.pkl'
                 if os.path.exists(mock_features_path):
-                    smiles_to_embedding = joblib.load(mock_features_path)
-                    logger.info(f"✅ Mock SMILES features loaded: {len(smiles_to_embedding)} molecules")
+                    smiles_features = joblib.load(mock_features_path)
+                    if 'matrix' in smiles_features:
+                        # {'matrix': (N, 64) float32, 'index': SMILES -> row}
+                        smiles_index = dict(smiles_features['index'])
+                        embedding_matrix = np.ascontiguousarray(smiles_features['matrix'], dtype=np.float32)
+                    else:
+                        # Older mock models: dict of SMILES -> 64-float vector
+                        smiles_index = {smiles: i for i, smiles in enumerate(smiles_features)}
+                        embedding_matrix = np.vstack(list(smiles_features.values())).astype(np.float32)
+                    logger.info(f"✅ Mock SMILES features loaded: {len(smiles_index)} molecules")
                     
                     # Set basic dataset stats
                     dataset_stats = {
-                        'total_molecules': len(smiles_to_embedding),
+                        'total_molecules': len(smiles_index),
                         'embedding_dimensions': 64,
                         'functional_groups': len(target_columns),
                         'dataset_loaded': True,
@@ -157,24 +422,19 @@ class MolecularPredictor:
                     return False
             
             # Load real dataset
-            df = pd.read_csv(dataset_path)
+            df = self.read_dataset(dataset_path)
             logger.info(f"📈 Dataset loaded: {len(df):,} molecules")
             
             # Create SMILES to embedding mapping
             
-            # Extract embedding columns (numeric features)
-            embedding_cols = df.select_dtypes(include=[np.number]).columns.tolist()
-            
-            # Remove target columns from embeddings
-            for target in target_columns:
-                if target in embedding_cols:
-                    embedding_cols.remove(target)
+            # Extract embedding columns (numeric features), excluding targets and SMILES
+            numeric_cols = df.select_dtypes(include=[np.number]).columns
+            exclude = set(target_columns) | {'smiles'}
+            embedding_cols = [c for c in numeric_cols if c not in exclude]
             
-            # Remove SMILES column if it exists
-            if 'smiles' in embedding_cols:
-                embedding_cols.remove('smiles')
-            
-            dataset_embeddings = df[embedding_cols].values
+            # float32 halves memory and bandwidth; sklearn trees use float32 internally
+            dataset_embeddings = df[embedding_cols].to_numpy(dtype=np.float32)
+            logger.info(f"Dataset embeddings: {dataset_embeddings.nbytes / 1e6:.1f} MB (float32)")
             
             # Create SMILES mapping if SMILES column exists
             if 'smiles' in df.columns:
@@ -182,12 +442,11 @@ class MolecularPredictor:
                 # Only process first 10000 rows for faster startup
                 sample_df = df.head(10000) if len(df) > 10000 else df
                 
-                for idx, row in sample_df.iterrows():
-                    smiles = row['smiles']
-                    embedding = row[embedding_cols].values
-                    smiles_to_embedding[smiles] = embedding
+                # Row view into dataset_embeddings indexed by SMILES (no extra copy)
+                embedding_matrix = dataset_embeddings[:len(sample_df)]
+                smiles_index = {smiles: i for i, smiles in enumerate(sample_df['smiles'].to_numpy())}
                 
-                logger.info(f"✅ SMILES mapping created: {len(smiles_to_embedding):,} molecules")
+                logger.info(f"✅ SMILES mapping created: {len(smiles_index):,} molecules")
             
             # Calculate dataset statistics
             dataset_stats = {
@@ -206,198 +465,276 @@ class MolecularPredictor:
             logger.error(f"❌ Error loading dataset: {str(e)}")
             return False
     
-    def formula_to_smiles(self, formula: str) -> Optional[str]:
-        """Convert molecular formula to SMILES notation"""
-        # Comprehensive molecular formulas to SMILES mapping
-        formula_map = {
-
-    # Simple inorganic molecules
-    'H2O': 'O', 'H₂O': 'O',
-    'CO2': 'O=C=O', 'CO₂': 'O=C=O',
-    'CO': '[C-]#[O+]',
-    'NH3': 'N', 'NH₃': 'N',
-    'CH4': 'C', 'CH₄': 'C',
-    'H2': '[H][H]', 'H₂': '[H][H]',
-    'O2': 'O=O', 'O₂': 'O=O',
-    'N2': 'N#N', 'N₂': 'N#N',
-    'HCl': 'Cl',
-    'HF': 'F',
-    'HBr': 'Br',
-    'HI': 'I',
-    'H2S': 'S', 'H₂S': 'S',
-    'SO2': 'O=S=O', 'SO₂': 'O=S=O',
-    'NO': '[N]=O',
-    'NO2': '[N+](=O)[O-]', 'NO₂': '[N+](=O)[O-]',
-    'N2O': '[N-]=[N+]=O', 'N₂O': '[N-]=[N+]=O',
-    'HNO3': 'O[N+](=O)[O-]', 'HNO₃': 'O[N+](=O)[O-]',
-    'H2SO4': 'OS(=O)(=O)O', 'H₂SO₄': 'OS(=O)(=O)O',
-    'H3PO4': 'OP(=O)(O)O', 'H₃PO₄': 'OP(=O)(O)O',
-
-    # Alcohols (single safest choice)
-    'CH3OH': 'CO', 'CH₃OH': 'CO',
-    'C2H6O': 'CCO', 'C₂H₆O': 'CCO',
-    'C3H8O': 'CCCO', 'C₃H₈O': 'CCCO',
-    'C4H10O': 'CCCCO', 'C₄H₁₀O': 'CCCCO',
-
-    # Aldehydes & ketones
-    'CH2O': 'C=O', 'CH₂O': 'C=O',
-    'C2H4O': 'CC=O', 'C₂H₄O': 'CC=O',
-    'C3H6O': 'CC(=O)C', 'C₃H₆O': 'CC(=O)C',
-
-    # Carboxylic acids
-    'CH2O2': 'C(=O)O', 'CH₂O₂': 'C(=O)O',
-    'C2H4O2': 'CC(=O)O', 'C₂H₄O₂': 'CC(=O)O',
-    'C3H6O2': 'CCC(=O)O', 'C₃H₆O₂': 'CCC(=O)O',
-    'C4H8O2': 'CCCC(=O)O', 'C₄H₈O₂': 'CCCC(=O)O',
-    'C7H6O2': 'O=C(O)c1ccccc1', 'C₇H₆O₂': 'O=C(O)c1ccccc1',
-
-    # Alkanes
-    'C2H6': 'CC', 'C₂H₆': 'CC',
-    'C3H8': 'CCC', 'C₃H₈': 'CCC',
-    'C4H10': 'CCCC', 'C₄H₁₀': 'CCCC',
-    'C5H12': 'CCCCC', 'C₅H₁₂': 'CCCCC',
-    'C6H14': 'CCCCCC', 'C₆H₁₄': 'CCCCCC',
-
-    # Alkenes
-    'C2H4': 'C=C', 'C₂H₄': 'C=C',
-    'C3H6': 'CC=C', 'C₃H₆': 'CC=C',
-
-    # Alkynes
-    'C2H2': 'C#C', 'C₂H₂': 'C#C',
-    'C3H4': 'CC#C', 'C₃H₄': 'CC#C',
-
-    # Aromatics
-    'C6H6': 'c1ccccc1', 'C₆H₆': 'c1ccccc1',
-    'C7H8': 'Cc1ccccc1', 'C₇H₈': 'Cc1ccccc1',
-    'C6H5OH': 'Oc1ccccc1',
-    'C6H4Cl2': 'Clc1ccc(Cl)cc1', 'C₆H₄Cl₂': 'Clc1ccc(Cl)cc1',
-
-    # Amines
-    'CH5N': 'CN', 'CH₅N': 'CN',
-    'C2H7N': 'CCN', 'C₂H₇N': 'CCN',
-    'C3H9N': 'CCCN', 'C₃H₉N': 'CCCN',
-    'C6H7N': 'Nc1ccccc1', 'C₆H₇N': 'Nc1ccccc1',
-
-    # Amides (corrected)
-    'CH3NO': 'C(=O)N', 'CH₃NO': 'C(=O)N',
-    'C2H5NO': 'CC(=O)N', 'C₂H₅NO': 'CC(=O)N',
-
-    # Nitriles
-    'C2H3N': 'CC#N', 'C₂H₃N': 'CC#N',
-    'C6H5CN': 'N#Cc1ccccc1', 'C₆H₅CN': 'N#Cc1ccccc1',
-
-    # Halogenated
-    'CH3Cl': 'CCl', 'CH₃Cl': 'CCl',
-    'CHCl3': 'C(Cl)(Cl)Cl', 'CHCl₃': 'C(Cl)(Cl)Cl',
-    'CCl4': 'C(Cl)(Cl)(Cl)Cl', 'CCl₄': 'C(Cl)(Cl)(Cl)Cl',
-
-    # Common biomolecules
-    'C6H12O6': 'C([C@@H]1[C@H]([C@@H]([C@H]([C@H](O1)O)O)O)O)O',
-    'C₂H₆O₂': 'OCCO', 'C2H6O2': 'OCCO',
-    'C3H8O3': 'OCC(O)CO', 'C₃H₈O₃': 'OCC(O)CO',
-
-}
-
+    def precompute_dataset_predictions(self) -> bool:
+        """Run both model levels once over all indexed dataset molecules
         
-        # Clean and normalize formula
-        clean_formula = formula.strip().replace(' ', '')
-        
-        # Try direct lookup
-        if clean_formula in formula_map:
-            return formula_map[clean_formula]
+        Dataset predictions are deterministic, so lookups of known SMILES
+        can skip inference entirely and slice these arrays instead.
+        """
+        if not self.models_loaded or embedding_matrix is None or not len(embedding_matrix):
+            return False
         
-        # Try variations (case, subscript normalization)
-        variations = [
-            clean_formula.upper(),
-            clean_formula.lower(),
-            clean_formula.replace('₁', '1').replace('₂', '2').replace('₃', '3')
-                         .replace('₄', '4').replace('₅', '5').replace('₆', '6')
-                         .replace('₇', '7').replace('₈', '8').replace('₉', '9')
-        ]
+        try:
+            start_time = time.time()
+            self.dataset_level1_pred, self.dataset_level1_confidence = self.predict_level1(embedding_matrix)
+            self.dataset_group_probas = self.predict_proba_all(embedding_matrix)
+            logger.info(f"✅ Precomputed predictions for {len(embedding_matrix):,} dataset molecules "
+                        f"({time.time() - start_time:.2f}s)")
+            return True
+            
+        except Exception as e:
+            logger.error(f"❌ Error precomputing dataset predictions: {str(e)}")
+            self.dataset_level1_pred = None
+            self.dataset_level1_confidence = None
+            self.dataset_group_probas = None
+            return False
+    
+    def dataset_prediction(self, idx: int) -> Optional[Tuple[int, float, Optional[Tuple[float, ...]], int]]:
+        """Precomputed prediction for a dataset row, in the same form as predict_molecule"""
+        if self.dataset_group_probas is None:
+            return None
         
-        for variation in variations:
-            if variation in formula_map:
-                return formula_map[variation]
+        level1_pred = int(self.dataset_level1_pred[idx])
+        group_probas = None
+        if level1_pred == 1:
+            group_probas = tuple(float(p) for p in self.dataset_group_probas[idx])
         
-        return None
+        return level1_pred, float(self.dataset_level1_confidence[idx]), group_probas, embedding_matrix.shape[1]
+    
+    def formula_to_smiles(self, formula: str) -> Optional[str]:
+        """Convert molecular formula to SMILES notation"""
+        return _FORMULA_MAP.get(_normalize_formula(formula))
     
-    def smiles_to_features(self, smiles: str) -> Optional[np.ndarray]:
-        """Convert SMILES to molecular feature vector"""
+    def smiles_to_features(self, smiles: str, mol: Any = None) -> Optional[np.ndarray]:
+        """Convert SMILES to molecular feature vector
+        
+        Pass mol when the SMILES has already been parsed to avoid parsing it again.
+        """
         try:
             # First check if SMILES exists in dataset
-            if smiles in smiles_to_embedding:
-                return smiles_to_embedding[smiles].reshape(1, -1)
+            idx = smiles_index.get(smiles)
+            if idx is not None:
+                return embedding_matrix[idx:idx + 1]
             
             # If not in dataset and RDKit is available, compute features
             if not RDKIT_AVAILABLE:
                 logger.warning("RDKit not available and SMILES not in dataset")
                 return None
             
-            mol = Chem.MolFromSmiles(smiles)
-            if mol is None:
+            raw_features = compute_descriptors(smiles, mol=mol)
+            if raw_features is None:
                 return None
             
-            # Compute molecular descriptors
-            features = []
-            try:
-                features.extend([
-                    Descriptors.MolWt(mol),
-                    Descriptors.MolLogP(mol),
-                    Descriptors.NumHDonors(mol),
-                    Descriptors.NumHAcceptors(mol),
-                    Descriptors.TPSA(mol),
-                    Descriptors.NumRotatableBonds(mol),
-                    Descriptors.NumAromaticRings(mol),
-                    Descriptors.NumSaturatedRings(mol),
-                    Descriptors.NumAliphaticRings(mol),
-                    Descriptors.RingCount(mol),
-                    Descriptors.NumHeteroatoms(mol),
-                    Descriptors.BertzCT(mol),
-                ])
-                
-                # Add more descriptors to reach expected feature count
-                try:
-                    features.extend([
-                        Descriptors.Kappa1(mol),
-                        Descriptors.Kappa2(mol),
-                        Descriptors.Kappa3(mol),
-                        Descriptors.FractionCsp3(mol),
-                        Descriptors.BalabanJ(mol),
-                    ])
-                except:
-                    features.extend([0.0] * 5)  # Fallback values
-                
-            except Exception as e:
-                logger.warning(f"Error computing descriptors: {e}")
-                features = [1.0] * 17  # Basic fallback
+            return self.pad_features(raw_features)
             
-            # Pad or truncate to match expected feature count
-            expected_features = len(feature_columns) if feature_columns else 64
+        except Exception as e:
+            logger.error("Error converting SMILES to features: %s", e)
+            return None
+    
+    def pad_features(self, features: np.ndarray) -> np.ndarray:
+        """Pad or truncate raw descriptors into a (1, F) float32 feature row"""
+        # Pad or truncate to match expected feature count (buffer is zero-padded)
+        expected_features = len(feature_columns) if feature_columns else 64
+        n_features = min(len(features), expected_features)
+        
+        buffer = np.zeros((1, expected_features), dtype=np.float32)
+        buffer[0, :n_features] = features[:n_features]
+        return buffer
+    
+    def predict_proba_all(self, features: np.ndarray) -> np.ndarray:
+        """Probability of each Level 2 group, shape (n_samples, n_groups)"""
+        columns = []
+        for model in self.level2_estimators:
+            proba = model.predict_proba(features)
+            if proba.shape[1] == 2:
+                columns.append(proba[:, 1])  # Probability of having this group
+            else:
+                # For single-class models, use the prediction directly
+                columns.append(model.predict(features).astype(float))
+        
+        if not columns:
+            return np.empty((features.shape[0], 0))
+        return np.column_stack(columns)
+    
+    def resolve_input(self, input_molecule: str) -> Tuple[Optional[Dict[str, Any]], str, str, str, Any]:
+        """Validate input and convert molecular formulas to SMILES
+        
+        Returns (error, original_input, smiles, input_type, mol); error is None on
+        success and mol is the parsed SMILES input (None if it was not parsed).
+        """
+        # Validate input
+        if not input_molecule or not isinstance(input_molecule, str):
+            return {
+                'success': False,
+                'error': 'Invalid input',
+                'message': 'Input must be a non-empty string'
+            }, input_molecule, input_molecule, 'smiles', None
+        
+        # Determine input type and convert to SMILES if needed
+        original_input = input_molecule.strip()
+        smiles = original_input
+        input_type = 'smiles'
+        mol = None
+        
+        # Try to parse as SMILES first
+        if RDKIT_AVAILABLE:
+            mol = Chem.MolFromSmiles(original_input)
+            if mol is None:
+                # If SMILES parsing fails, try as molecular formula
+                converted_smiles = self.formula_to_smiles(original_input)
+                if converted_smiles:
+                    smiles = converted_smiles
+                    input_type = 'formula'
+                    logger.info("Converted formula %s → %s", original_input, smiles)
+                else:
+                    return {
+                        'success': False,
+                        'error': 'Invalid input',
+                        'message': f'Could not parse "{original_input}" as SMILES or molecular formula'
+                    }, original_input, smiles, input_type, None
+        
+        return None, original_input, smiles, input_type, mol
+    
+    def predict_level1(self, features: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Level 1 predictions and confidences for every row of features"""
+        level1_model = models['level1']
+        level1_pred = level1_model.predict(features)
+        level1_proba = level1_model.predict_proba(features)
+        
+        # Handle different probability array shapes
+        if level1_proba.shape[1] == 2:
+            level1_confidence = level1_proba.max(axis=1)
+        else:
+            level1_confidence = level1_pred.astype(float)
+        
+        return level1_pred, level1_confidence
+    
+    def build_result(self, original_input: str, input_type: str, smiles: str,
+                     level1_pred: int, level1_confidence: float,
+                     group_probas: Optional[np.ndarray], feature_count: int,
+                     processing_time: float, timestamp: Optional[str] = None,
+                     idx: Optional[int] = None) -> Dict[str, Any]:
+        """Assemble the API response for a single molecule
+        
+        idx is the molecule's dataset row (None if it is not in the dataset).
+        Batch callers pass one shared timestamp instead of formatting one per result.
+        """
+        # Level 2 Predictions (Multi-label: which specific groups?)
+        detected_groups = []
+        
+        if level1_pred == 1:  # Has functional groups
+            level2_predictions = {
+                group_name: float(confidence)
+                for group_name, confidence in zip(self.level2_groups, group_probas)
+            }
+            
+            # Consider detected if confidence > 0.5
+            detected_groups = [
+                group_name for group_name, confidence in level2_predictions.items()
+                if confidence > 0.5
+            ]
+        else:
+            # If Level 1 says no functional groups, set all Level 2 to low confidence
+            level2_predictions = dict.fromkeys(target_columns, 0.1)
+        
+        # Check if molecule is in dataset (exact or canonical SMILES match)
+        in_dataset = idx is not None
+        
+        return {
+            'success': True,
+            'original_input': original_input,
+            'input_type': input_type,
+            'smiles': smiles,
+            'processing_time': round(processing_time, 4),
+            'timestamp': timestamp or datetime.now().isoformat(),
             
-            if len(features) < expected_features:
-                features.extend([0.0] * (expected_features - len(features)))
-            elif len(features) > expected_features:
-                features = features[:expected_features]
+            # Level 1 Results
+            'level1': {
+                'has_functional_groups': bool(level1_pred),
+                'confidence': float(level1_confidence),
+                'prediction': 'HAS_GROUPS' if level1_pred else 'NO_GROUPS'
+            },
             
-            return np.array(features).reshape(1, -1)
+            # Level 2 Results
+            'level2': {
+                'functional_groups': level2_predictions,
+                'detected_groups': detected_groups,
+                'total_detected': len(detected_groups)
+            },
             
-        except Exception as e:
-            logger.error(f"Error converting SMILES to features: {str(e)}")
+            # Metadata
+            'metadata': {
+                'in_dataset': in_dataset,
+                'model_version': '1.0.0',
+                'algorithm': 'Random Forest Multi-level',
+                'feature_count': feature_count
+            },
+            
+            # Warnings
+            'warnings': [] if in_dataset else [
+                'Molecule not found in training dataset - predictions may be less accurate'
+            ]
+        }
+    
+    def dataset_lookup(self, smiles: str, mol: Any = None) -> Tuple[Optional[int], str, Any]:
+        """Find a molecule's dataset row by exact SMILES, then by canonical SMILES
+        
+        Shared by /predict and /batch_predict so both resolve equivalent spellings
+        (e.g. OCC for CCO, or SMILES converted from a formula) to the same row.
+        Returns (idx, key, mol): idx is the row of embedding_matrix (None if absent);
+        key is the exact SMILES if it is indexed, otherwise the canonical SMILES,
+        and doubles as the prediction cache key; mol is the parsed molecule
+        (parsed here if not given) so later steps need not parse it again.
+        """
+        idx = smiles_index.get(smiles)
+        if idx is not None or not RDKIT_AVAILABLE:
+            return idx, smiles, mol
+        
+        if mol is None:
+            mol = Chem.MolFromSmiles(smiles)
+        if mol is None:
+            return None, smiles, None
+        
+        key = canonical_smiles(smiles, mol=mol)
+        return smiles_index.get(key), key, mol
+    
+    def predict_molecule(self, smiles: str, mol: Any = None) -> Optional[Tuple[int, float, Optional[Tuple[float, ...]], int]]:
+        """Run both model levels for one molecule
+        
+        Returns an immutable (level1_pred, level1_confidence, group_probas,
+        feature_count) tuple suitable for caching, or None if featurization fails.
+        """
+        features = self.smiles_to_features(smiles, mol=mol)
+        if features is None:
             return None
+        
+        # Concurrent requests share one model call through the micro-batcher
+        if self.batcher is not None:
+            level1_pred, level1_confidence, group_probas = self.batcher.submit(features)
+        else:
+            level1_pred, level1_confidence, group_probas = self.infer_rows(features)[0]
+        
+        return level1_pred, level1_confidence, group_probas, features.shape[1]
+    
+    def infer_rows(self, features: np.ndarray) -> List[Tuple[int, float, Optional[Tuple[float, ...]]]]:
+        """Run both model levels on a feature matrix, one result tuple per row"""
+        # Level 1 Prediction (Binary: has any functional groups?)
+        level1_pred, level1_confidence = self.predict_level1(features)
+        
+        # Level 2 Predictions only run on rows where Level 1 finds functional groups
+        has_groups = np.flatnonzero(level1_pred == 1)
+        group_probas = self.predict_proba_all(features[has_groups]) if len(has_groups) else None
+        
+        results = [(int(pred), float(conf), None) for pred, conf in zip(level1_pred, level1_confidence)]
+        for row, probas in zip(has_groups, group_probas if group_probas is not None else []):
+            results[row] = (results[row][0], results[row][1], tuple(float(p) for p in probas))
+        return results
     
     def predict_functional_groups(self, input_molecule: str) -> Dict[str, Any]:
         """Make predictions using the multi-level ML pipeline"""
         start_time = time.time()
         
         try:
-            # Validate input
-            if not input_molecule or not isinstance(input_molecule, str):
-                return {
-                    'success': False,
-                    'error': 'Invalid input',
-                    'message': 'Input must be a non-empty string'
-                }
-            
             # Check if models are loaded
             if not self.models_loaded:
                 return {
@@ -406,128 +743,41 @@ class MolecularPredictor:
                     'message': 'ML models are not properly loaded'
                 }
             
-            # Determine input type and convert to SMILES if needed
-            original_input = input_molecule.strip()
-            smiles = original_input
-            input_type = 'smiles'
-            
-            # Try to parse as SMILES first
-            if RDKIT_AVAILABLE:
-                mol = Chem.MolFromSmiles(original_input)
-                if mol is None:
-                    # If SMILES parsing fails, try as molecular formula
-                    converted_smiles = self.formula_to_smiles(original_input)
-                    if converted_smiles:
-                        smiles = converted_smiles
-                        input_type = 'formula'
-                        logger.info(f"Converted formula {original_input} → {smiles}")
-                    else:
-                        return {
-                            'success': False,
-                            'error': 'Invalid input',
-                            'message': f'Could not parse "{original_input}" as SMILES or molecular formula'
-                        }
-            
-            # Convert SMILES to features
-            features = self.smiles_to_features(smiles)
-            if features is None:
+            error, original_input, smiles, input_type, mol = self.resolve_input(input_molecule)
+            if error is not None:
+                return error
+            
+            # Dataset molecules use precomputed predictions; others run (or reuse) the pipeline.
+            # The canonical SMILES is computed once and serves both the dataset lookup
+            # and the prediction cache key
+            idx, key, mol = self.dataset_lookup(smiles, mol=mol)
+            prediction = self.dataset_prediction(idx) if idx is not None else None
+            if prediction is None:
+                prediction = self.prediction_cache.get(key)
+                if prediction is None:
+                    prediction = self.predict_molecule(key, mol=mol)
+                    if prediction is not None:
+                        self.prediction_cache.put(key, prediction)
+            if prediction is None:
                 return {
                     'success': False,
                     'error': 'Feature extraction failed',
                     'message': 'Could not convert molecule to features for prediction'
                 }
+            level1_pred, level1_confidence, group_probas, feature_count = prediction
             
-            # Level 1 Prediction (Binary: has any functional groups?)
-            level1_model = models['level1']
-            level1_pred = level1_model.predict(features)[0]
-            level1_proba = level1_model.predict_proba(features)[0]
-            
-            # Handle different probability array shapes
-            if len(level1_proba) == 2:
-                level1_confidence = float(max(level1_proba))
-            else:
-                level1_confidence = float(level1_pred)
-            
-            # Level 2 Predictions (Multi-label: which specific groups?)
-            level2_models = models['level2']
-            level2_predictions = {}
-            detected_groups = []
-            
-            # Run Level 2 predictions for each functional group
-            if level1_pred == 1:  # Has functional groups
-                for group_name in target_columns:
-                    if group_name in level2_models:
-                        group_model = level2_models[group_name]
-                        group_pred = group_model.predict(features)[0]
-                        group_proba = group_model.predict_proba(features)[0]
-                        
-                        # Handle different probability array shapes
-                        if len(group_proba) == 2:
-                            group_confidence = float(group_proba[1])  # Probability of having this group
-                        else:
-                            # For single-class predictions, use the prediction directly
-                            group_confidence = float(group_pred)
-                        
-                        level2_predictions[group_name] = group_confidence
-                        
-                        # Consider detected if confidence > 0.5
-                        if group_confidence > 0.5:
-                            detected_groups.append(group_name)
-            else:
-                # If Level 1 says no functional groups, set all Level 2 to low confidence
-                for group_name in target_columns:
-                    level2_predictions[group_name] = 0.1
-            
-            # Check if molecule is in dataset
-            in_dataset = smiles in smiles_to_embedding
-            
-            # Prepare response
             processing_time = time.time() - start_time
+            result = self.build_result(
+                original_input, input_type, smiles,
+                level1_pred, level1_confidence, group_probas,
+                feature_count, processing_time, idx=idx
+            )
             
-            result = {
-                'success': True,
-                'original_input': original_input,
-                'input_type': input_type,
-                'smiles': smiles,
-                'processing_time': round(processing_time, 4),
-                'timestamp': datetime.now().isoformat(),
-                
-                # Level 1 Results
-                'level1': {
-                    'has_functional_groups': bool(level1_pred),
-                    'confidence': round(level1_confidence, 4),
-                    'prediction': 'HAS_GROUPS' if level1_pred else 'NO_GROUPS'
-                },
-                
-                # Level 2 Results
-                'level2': {
-                    'functional_groups': {
-                        group: round(conf, 4) 
-                        for group, conf in level2_predictions.items()
-                    },
-                    'detected_groups': detected_groups,
-                    'total_detected': len(detected_groups)
-                },
-                
-                # Metadata
-                'metadata': {
-                    'in_dataset': in_dataset,
-                    'model_version': '1.0.0',
-                    'algorithm': 'Random Forest Multi-level',
-                    'feature_count': features.shape[1] if features is not None else 0
-                },
-                
-                # Warnings
-                'warnings': [] if in_dataset else [
-                    'Molecule not found in training dataset - predictions may be less accurate'
-                ]
-            }
-            
-            logger.info(f"✅ Prediction completed: {original_input} → {smiles} ({processing_time:.3f}s)")
+            logger.info("✅ Prediction completed: %s → %s (%.3fs)", original_input, smiles, processing_time)
             return result
             
         except Exception as e:
-            logger.error(f"❌ Prediction error: {str(e)}")
+            logger.error("❌ Prediction error: %s", e)
             return {
                 'success': False,
                 'error': 'Prediction failed',
@@ -535,6 +785,105 @@ class MolecularPredictor:
                 'original_input': input_molecule,
                 'timestamp': datetime.now().isoformat()
             }
+    
+    def predict_batch(self, molecules_list: List[str]) -> List[Dict[str, Any]]:
+        """Predict a batch of molecules with one model call per level
+        
+        Molecules are featurized into a single (N, F) matrix so each model
+        runs predict_proba once for the whole batch instead of once per molecule.
+        """
+        start_time = time.time()
+        timestamp = datetime.now().isoformat()
+        
+        if not self.models_loaded:
+            return [{
+                'success': False,
+                'error': 'Models not loaded',
+                'message': 'ML models are not properly loaded'
+            } for _ in molecules_list]
+        
+        results: List[Optional[Dict[str, Any]]] = [None] * len(molecules_list)
+        candidates = []  # (position, original_input, smiles, input_type, idx)
+        parsed_mols = {}  # SMILES -> Mol already parsed during validation or lookup
+        
+        for position, input_molecule in enumerate(molecules_list):
+            error, original_input, smiles, input_type, mol = self.resolve_input(input_molecule)
+            if error is not None:
+                results[position] = error
+                continue
+            idx, _, mol = self.dataset_lookup(smiles, mol=mol)
+            candidates.append((position, original_input, smiles, input_type, idx))
+            if mol is not None:
+                parsed_mols[smiles] = mol
+        
+        # Compute descriptors for all molecules outside the dataset in one pass
+        new_smiles = list(dict.fromkeys(
+            smiles for _, _, smiles, _, idx in candidates if idx is None
+        ))
+        raw_descriptors = dict(zip(new_smiles, compute_descriptors_batch(
+            new_smiles, mols=[parsed_mols.get(smiles) for smiles in new_smiles]
+        )))
+        
+        resolved = []  # (position, original_input, smiles, input_type, idx)
+        # Preallocated (N, F) feature matrix at the width the models expect, filled row by row
+        expected_features = len(feature_columns) if feature_columns else 64
+        X = np.zeros((len(candidates), expected_features), dtype=np.float32)
+        
+        for position, original_input, smiles, input_type, idx in candidates:
+            # Dataset molecules skip inference using precomputed predictions
+            prediction = self.dataset_prediction(idx) if idx is not None else None
+            if prediction is not None:
+                results[position] = self.build_result(
+                    original_input, input_type, smiles, *prediction,
+                    processing_time=time.time() - start_time, timestamp=timestamp, idx=idx
+                )
+                continue
+            
+            if idx is not None:
+                features = embedding_matrix[idx:idx + 1]
+            elif raw_descriptors.get(smiles) is not None:
+                features = self.pad_features(raw_descriptors[smiles])
+            else:
+                features = None
+            
+            # A row of the wrong width (e.g. dataset embeddings that do not match
+            # the models) fails on its own instead of failing the whole batch
+            if features is None or features.shape[1] != expected_features:
+                results[position] = {
+                    'success': False,
+                    'error': 'Feature extraction failed',
+                    'message': 'Could not convert molecule to features for prediction'
+                }
+                continue
+            
+            X[len(resolved)] = features[0]
+            resolved.append((position, original_input, smiles, input_type, idx))
+        
+        if resolved:
+            try:
+                X = X[:len(resolved)]
+                predictions = self.infer_rows(X)
+                
+                processing_time = time.time() - start_time
+                for prediction, (position, original_input, smiles, input_type, idx) in zip(predictions, resolved):
+                    results[position] = self.build_result(
+                        original_input, input_type, smiles, *prediction,
+                        feature_count=X.shape[1], processing_time=processing_time,
+                        timestamp=timestamp, idx=idx
+                    )
+            except Exception as e:
+                logger.error("❌ Batch prediction error: %s", e)
+                for position, original_input, _, _, _ in resolved:
+                    results[position] = {
+                        'success': False,
+                        'error': 'Prediction failed',
+                        'message': str(e),
+                        'original_input': original_input,
+                        'timestamp': timestamp
+                    }
+        
+        logger.info("✅ Batch prediction completed: %d molecules (%.3fs)", len(molecules_list), time.time() - start_time)
+        return results
 
 # Initialize predictor
 predictor = MolecularPredictor()
@@ -543,7 +892,7 @@ predictor = MolecularPredictor()
 @app.route('/')
 def index():
     """API information endpoint"""
-    return jsonify({
+    return _json_response({
         'name': 'Molecular Functional Group Predictor API',
         'version': '1.0.0',
         'status': 'active',
@@ -564,7 +913,7 @@ def index():
 @app.route('/health')
 def health_check():
     """Health check endpoint"""
-    return jsonify({
+    return _json_response({
         'status': 'healthy',
         'timestamp': datetime.now().isoformat(),
         'models_loaded': predictor.models_loaded,
@@ -580,7 +929,7 @@ def health_check():
 @app.route('/stats')
 def get_stats():
     """Get system and model statistics"""
-    return jsonify({
+    return _json_response({
         'dataset_stats': dataset_stats,
         'model_stats': {
             'level1_loaded': 'level1' in models,
@@ -588,6 +937,7 @@ def get_stats():
             'target_groups': len(target_columns),
             'feature_dimensions': len(feature_columns)
         },
+        'prediction_cache': predictor.prediction_cache.info(),
         'system_info': {
             'rdkit_available': RDKIT_AVAILABLE,
             'uptime': 'Active',
@@ -598,7 +948,7 @@ def get_stats():
 @app.route('/models')
 def get_models():
     """Get model information"""
-    return jsonify({
+    return _json_response({
         'models': {
             'level1': {
                 'type': 'Binary Classifier',
@@ -625,37 +975,37 @@ def predict():
         data = request.get_json()
         
         if not data:
-            return jsonify({
+            return _json_response({
                 'success': False,
                 'error': 'No data provided',
                 'message': 'Request body must contain JSON data'
-            }), 400
+            }, 400)
         
         # Extract input (can be SMILES or molecular formula)
         input_molecule = data.get('smiles', '').strip()
         
         if not input_molecule:
-            return jsonify({
+            return _json_response({
                 'success': False,
                 'error': 'No input provided',
                 'message': 'Request must include "smiles" field (accepts SMILES or molecular formula)'
-            }), 400
+            }, 400)
         
         # Make prediction
         result = predictor.predict_functional_groups(input_molecule)
         
         # Return appropriate status code
         status_code = 200 if result['success'] else 400
-        return jsonify(result), status_code
+        return _json_response(result, status_code)
         
     except Exception as e:
-        logger.error(f"❌ API error: {str(e)}")
-        return jsonify({
+        logger.error("❌ API error: %s", e)
+        return _json_response({
             'success': False,
             'error': 'Internal server error',
             'message': str(e),
             'timestamp': datetime.now().isoformat()
-        }), 500
+        }, 500)
 
 @app.route('/batch_predict', methods=['POST'])
 def batch_predict():
@@ -665,27 +1015,24 @@ def batch_predict():
         molecules_list = data.get('smiles_list', [])
         
         if not molecules_list or not isinstance(molecules_list, list):
-            return jsonify({
+            return _json_response({
                 'success': False,
                 'error': 'Invalid input',
                 'message': 'Request must include "smiles_list" as an array'
-            }), 400
+            }, 400)
         
         # Limit batch size for performance
         if len(molecules_list) > 100:
-            return jsonify({
+            return _json_response({
                 'success': False,
                 'error': 'Batch too large',
                 'message': 'Maximum batch size is 100 molecules'
-            }), 400
+            }, 400)
         
-        # Process batch
-        results = []
-        for molecule in molecules_list:
-            result = predictor.predict_functional_groups(molecule)
-            results.append(result)
+        # Process batch with a single feature matrix
+        results = predictor.predict_batch(molecules_list)
         
-        return jsonify({
+        return _json_response({
             'success': True,
             'batch_size': len(molecules_list),
             'results': results,
@@ -693,30 +1040,30 @@ def batch_predict():
         })
         
     except Exception as e:
-        logger.error(f"❌ Batch prediction error: {str(e)}")
-        return jsonify({
+        logger.error("❌ Batch prediction error: %s", e)
+        return _json_response({
             'success': False,
             'error': 'Batch prediction failed',
             'message': str(e)
-        }), 500
+        }, 500)
 
 # Error handlers
 @app.errorhandler(404)
 def not_found(error):
-    return jsonify({
+    return _json_response({
         'success': False,
         'error': 'Endpoint not found',
         'message': 'The requested endpoint does not exist',
         'available_endpoints': ['/predict', '/health', '/stats', '/models']
-    }), 404
+    }, 404)
 
 @app.errorhandler(500)
 def internal_error(error):
-    return jsonify({
+    return _json_response({
         'success': False,
         'error': 'Internal server error',
         'message': 'An unexpected error occurred'
-    }), 500
+    }, 500)
 
 if __name__ == '__main__':
     print("🚀 MOLECULAR FUNCTIONAL GROUP PREDICTOR API")
@@ -762,7 +1109,7 @@ if __name__ == '__main__':
     print("💡 Supports SMILES (CCO) and formulas (H2O, HNO3)")
     print("=" * 60)
     
-    # Start Flask app
+    # Start Flask development server (production runs gunicorn via wsgi.py)
     app.run(
         debug=False,
         host='0.0.0.0',
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Micro-batching for concurrent single-molecule predictions
+
+Concurrent /predict requests each hand their feature row to a background
+thread, which waits a few milliseconds for more rows and then runs the
+models once on the stacked matrix (the service_streamer pattern).
+"""
+
+import os
+import time
+import queue
+import logging
+import threading
+from typing import Any, Callable, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class _PendingRow:
+    """A single feature row waiting for its batched result"""
+
+    __slots__ = ('features', 'event', 'result', 'error', 'cancelled', 'taken')
+
+    def __init__(self, features: np.ndarray):
+        self.features = features
+        self.event = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+        self.cancelled = False  # caller gave up and predicts the row itself
+        self.taken = False      # collector has committed to predicting the row
+
+
+class MicroBatcher:
+    """Coalesce concurrent single-row inference calls into one batched call
+
+    predict_fn takes an (N, F) matrix and returns a list of N per-row results.
+    """
+
+    def __init__(self, predict_fn: Callable[[np.ndarray], List[Any]],
+                 max_batch: int = 32, max_wait: float = 0.005, timeout: float = 0.05):
+        self.predict_fn = predict_fn
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._claim_lock = threading.Lock()  # decides taken vs cancelled for a row
+        self._queue = None
+        self._thread = None
+        self._pid = None
+
+    def _ensure_started(self) -> None:
+        """Start the collector thread lazily (and again in each forked worker)"""
+        if self._pid == os.getpid() and self._thread.is_alive():
+            return
+
+        with self._lock:
+            if self._pid == os.getpid() and self._thread.is_alive():
+                return
+            self._queue = queue.Queue()
+            self._thread = threading.Thread(target=self._run, name='micro-batcher', daemon=True)
+            self._thread.start()
+            self._pid = os.getpid()
+
+    def submit(self, features: np.ndarray) -> Any:
+        """Predict one (1, F) feature row, batched with any concurrent callers"""
+        self._ensure_started()
+
+        pending = _PendingRow(features)
+        self._queue.put(pending)
+
+        if not pending.event.wait(self.timeout):
+            # Collector is backed up; run this row directly rather than wait longer,
+            # unless the collector already took it (then its result is on the way)
+            with self._claim_lock:
+                if not pending.taken:
+                    pending.cancelled = True
+            if pending.cancelled:
+                return self.predict_fn(features)[0]
+            pending.event.wait()
+
+        if pending.error is not None:
+            raise pending.error
+        return pending.result
+
+    def _run(self) -> None:
+        """Collector loop: drain up to max_batch rows, predict once, fan results out"""
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.max_wait
+
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            with self._claim_lock:
+                batch = [pending for pending in batch if not pending.cancelled]
+                for pending in batch:
+                    pending.taken = True
+            if not batch:
+                continue
+
+            try:
+                results = self.predict_fn(np.vstack([pending.features for pending in batch]))
+                for pending, result in zip(batch, results):
+                    pending.result = result
+            except Exception as e:
+                logger.error("❌ Micro-batch prediction error: %s", e)
+                for pending in batch:
+                    pending.error = e
+            finally:
+                for pending in batch:
+                    pending.event.set()
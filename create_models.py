@@ -4,13 +4,50 @@ Create mock models for deployment when real trained models are not available
 """
 
 import os
+import pickle
+import hashlib
 import joblib
 import numpy as np
 from sklearn.dummy import DummyClassifier
+from mock_models import MockProba
+from descriptors import RDKIT_AVAILABLE, canonical_smiles
 import json
 
+# Bump when the mock data changes in a way not captured by manifest_key's inputs
+MOCK_MODELS_VERSION = '1.0.0'
+MOCK_SEED = 42
+
+MANIFEST_PATH = 'models/.manifest'
+OUTPUT_PATHS = [
+    'models/model_level1.pkl',
+    'models/models_level2.pkl',
+    'models/smiles_features.pkl',
+    'models/pipeline_metadata.json',
+]
+
+def manifest_key(target_columns, feature_columns, group_probs, supported_smiles):
+    """Hash of everything that determines the mock model files
+    
+    Includes RDKIT_AVAILABLE because it decides whether the SMILES index keys
+    are canonicalized.
+    """
+    spec = {
+        'target_columns': target_columns,
+        'feature_columns': feature_columns,
+        'group_probs': group_probs,
+        'supported_smiles': supported_smiles,
+        'rdkit_available': RDKIT_AVAILABLE,
+        'seed': MOCK_SEED,
+        'version': MOCK_MODELS_VERSION,
+    }
+    return hashlib.sha256(json.dumps(spec, sort_keys=True).encode()).hexdigest()
+
 def create_mock_models():
-    """Create simple mock models for deployment"""
+    """Create simple mock models for deployment
+    
+    Skipped when models/.manifest matches and all outputs exist, since the
+    outputs are deterministic for a given manifest key.
+    """
     
     # Create models directory
     os.makedirs('models', exist_ok=True)
@@ -24,54 +61,68 @@ def create_mock_models():
     # Define feature columns
     feature_columns = [f'emb_{i}' for i in range(64)]
     
+    # Mock Level 2 models report a fixed presence probability per group:
+    # alcohol and ether common, fluorinated rare, the rest moderate
+    group_probs = [0.7, 0.3, 0.3, 0.3, 0.3, 0.3, 0.6, 0.005, 0.3]
+    
+    # Create a simple SMILES to features mapping for common molecules
+    supported_smiles = [
+        'CCO',  # Ethanol
+        'CC(=O)C',  # Acetone
+        'H2O',  # Water
+        'CN',  # Methylamine
+        'C=C',  # Ethene
+        'HNO3',  # Nitric acid
+        'CH3OH',  # Methanol
+        'C2H5OH',  # Ethanol formula
+        'NH3',  # Ammonia
+        'c1ccccc1',  # Benzene
+    ]
+    
+    # Nothing to do if the same mock models were already generated
+    key = manifest_key(target_columns, feature_columns, group_probs, supported_smiles)
+    if os.path.exists(MANIFEST_PATH) and all(os.path.exists(p) for p in OUTPUT_PATHS):
+        with open(MANIFEST_PATH) as f:
+            if f.read() == key:
+                print("[OK] Mock models are up to date - skipping generation")
+                return
+    
+    # Single seeded generator for all mock data
+    rng = np.random.default_rng(MOCK_SEED)
+    
     # Create mock Level 1 model
     level1_model = DummyClassifier(strategy='constant', constant=1)
-    X_dummy = np.random.random((100, 64))
-    y_dummy = np.ones(100)
+    X_dummy = rng.random((100, 64), dtype=np.float32)
+    y_dummy = np.ones(100, dtype=np.int8)
     level1_model.fit(X_dummy, y_dummy)
     
-    # Create mock Level 2 models with realistic predictions
-    level2_models = {}
-    for group in target_columns:
-        model = DummyClassifier(strategy='stratified', random_state=42)
-        if group == 'alcohol':
-            y_group = np.random.choice([0, 1], 100, p=[0.3, 0.7])  # Alcohol common
-        elif group == 'ether':
-            y_group = np.random.choice([0, 1], 100, p=[0.4, 0.6])  # Ether common
-        elif group == 'fluorinated':
-            y_group = np.random.choice([0, 1], 100, p=[0.995, 0.005])  # Fluorinated rare
-        else:
-            y_group = np.random.choice([0, 1], 100, p=[0.7, 0.3])  # Moderate frequency
-        model.fit(X_dummy, y_group)
-        level2_models[group] = model
-    
-    # Save models
-    joblib.dump(level1_model, 'models/model_level1.pkl')
-    joblib.dump(level2_models, 'models/models_level2.pkl')
-    joblib.dump(target_columns, 'models/target_columns.pkl')
-    joblib.dump(feature_columns, 'models/feature_columns.pkl')
+    # Create mock Level 2 models
+    level2_models = {group: MockProba(p) for group, p in zip(target_columns, group_probs)}
     
-    # Create a simple SMILES to features mapping for common molecules
-    smiles_features = {
-        'CCO': np.random.random(64),  # Ethanol
-        'CC(=O)C': np.random.random(64),  # Acetone
-        'H2O': np.random.random(64),  # Water
-        'CN': np.random.random(64),  # Methylamine
-        'C=C': np.random.random(64),  # Ethene
-        'HNO3': np.random.random(64),  # Nitric acid
-        'CH3OH': np.random.random(64),  # Methanol
-        'C2H5OH': np.random.random(64),  # Ethanol formula
-        'NH3': np.random.random(64),  # Ammonia
-        'c1ccccc1': np.random.random(64),  # Benzene
-    }
+    # Save models with zlib level 3: mock pickles are a few hundred bytes,
+    # so decompressing them at startup costs microseconds
+    joblib.dump(level1_model, 'models/model_level1.pkl', compress=3, protocol=pickle.HIGHEST_PROTOCOL)
+    joblib.dump(level2_models, 'models/models_level2.pkl', compress=3, protocol=pickle.HIGHEST_PROTOCOL)
+    
+    # One contiguous (N, 64) float32 matrix; row i belongs to supported_smiles[i]
+    emb_matrix = rng.random((len(supported_smiles), 64), dtype=np.float32)
+    
+    # Key by canonical SMILES so app.py finds equivalent inputs (e.g. OCC for CCO);
+    # formula keys such as H2O are not valid SMILES and are kept as written
+    if RDKIT_AVAILABLE:
+        from rdkit import RDLogger
+        RDLogger.DisableLog('rdApp.error')
+    smiles_to_row = {canonical_smiles(smiles): i for i, smiles in enumerate(supported_smiles)}
     
     # Save the SMILES mapping
-    joblib.dump(smiles_features, 'models/smiles_features.pkl')
+    smiles_features = {'matrix': emb_matrix, 'index': smiles_to_row}
+    joblib.dump(smiles_features, 'models/smiles_features.pkl', compress=3, protocol=pickle.HIGHEST_PROTOCOL)
     
-    # Create pipeline metadata
+    # Create pipeline metadata; app.py reads the column lists from here,
+    # so they are not pickled separately
     metadata = {
         'model_type': 'mock_models',
-        'version': '1.0.0',
+        'version': MOCK_MODELS_VERSION,
         'created_date': '2025-12-26',
         'target_columns': target_columns,
         'feature_columns': feature_columns,
@@ -81,11 +132,15 @@ def create_mock_models():
     with open('models/pipeline_metadata.json', 'w') as f:
         json.dump(metadata, f, indent=2)
     
-    print("✅ Mock models created successfully!")
-    print("📋 Supported molecules for prediction:")
-    for smiles in smiles_features.keys():
+    # Written last so an interrupted run is regenerated next time
+    with open(MANIFEST_PATH, 'w') as f:
+        f.write(key)
+    
+    print("[OK] Mock models created successfully!")
+    print("Supported molecules:")
+    for smiles in smiles_to_row:
         print(f"   - {smiles}")
-    print("🔄 Ready for deployment!")
+    print("Ready for deployment!")
 
 if __name__ == "__main__":
     create_mock_models()
\ No newline at end of file
@@ -0,0 +1,29 @@
+"""
+Gunicorn configuration for the Molecular Functional Group Predictor API
+"""
+
+import os
+
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gevent')
+
+# preload_app imports app.py in the master, before the gevent worker would
+# monkey-patch. Patch first so locks and threads created at import time
+# (e.g. the micro-batcher's) cooperate with gevent instead of blocking the worker
+if worker_class == 'gevent':
+    from gevent import monkey
+    monkey.patch_all()
+
+import multiprocessing  # noqa: E402
+
+# Bind to the port provided by the platform (Render requirement)
+bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
+
+# One worker per core; gevent lets each worker hold many open connections
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count()))
+worker_connections = 1000
+
+# Load models once in the master before forking; workers share those pages
+# copy-on-write instead of each loading their own copy
+preload_app = True
+
+timeout = 120
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Lightweight stand-ins for trained estimators, used by create_models.py
+
+Kept in its own module so the pickled mock models can be unpickled by
+app.py (a class defined in create_models.py run as a script would be
+pickled as __main__.MockProba and fail to load).
+"""
+
+import numpy as np
+
+
+class MockProba:
+    """Mock Level 2 classifier that reports a fixed probability for its group"""
+
+    __slots__ = ('p',)
+
+    def __init__(self, p: float):
+        self.p = float(p)
+
+    def predict_proba(self, X) -> np.ndarray:
+        """Return an (n, 2) float64 array of [absent, present] probabilities
+
+        float64 like sklearn's predict_proba, so the API reports 0.7 rather than
+        the float32 rounding 0.699999988079071.
+        """
+        out = np.empty((X.shape[0], 2), dtype=np.float64)
+        out[:, 1] = self.p
+        out[:, 0] = 1.0 - self.p
+        return out
+
+    def predict(self, X) -> np.ndarray:
+        """Return the most likely class (0 or 1) for every row"""
+        return np.full(X.shape[0], int(self.p >= 0.5), dtype=np.int8)
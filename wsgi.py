@@ -0,0 +1,8 @@
+#!/usr/bin/env python3
+"""
+WSGI entry point for production servers
+
+Run with: gunicorn -c gunicorn.conf.py wsgi:app
+"""
+
+from app import app  # noqa: F401